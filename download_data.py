@@ -1,19 +1,33 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import datetime as dt
+import hashlib
+import os
 import time
 
+CACHE_DIR = ".cache"
+
 def load_or_download_data():
     """
     Downloads the latest market data for a given universe of assets.
     Implements a retry mechanism for network issues and validates the
     downloaded data to prevent errors from empty datasets.
+    Validated prices are cached to Parquet per day, so reruns skip the network.
     """
     universe = ["SPY", "QQQ", "IWM", "GLD", "BTC-USD", "ETH-USD", "EURUSD=X"]
     today = dt.datetime.utcnow().date()
     # --- CHANGE: Download 90 days of data to satisfy all strategy lookback periods ---
     start = today - dt.timedelta(days=90)
 
+    # Reuse today's download if we already fetched this universe
+    universe_key = hashlib.md5(",".join(sorted(universe)).encode()).hexdigest()[:8]
+    cache_path = os.path.join(CACHE_DIR, f"prices_{today.isoformat()}_{universe_key}.parquet")
+    if os.path.exists(cache_path):
+        close = pd.read_parquet(cache_path)
+        print(f"Loaded cached market data from {cache_path}. Found {len(close)} days of data.")
+        return close
+
     print("Attempting to download market data...")
 
     # Retry loop for transient network errors (e.g., connection issues)
@@ -26,6 +40,7 @@ def load_or_download_data():
                 end=today + dt.timedelta(days=1),
                 interval="1d",
                 auto_adjust=True,
+                group_by="column",
                 progress=False
             )
 
@@ -34,19 +49,24 @@ def load_or_download_data():
             if df.empty:
                 raise ValueError("yfinance returned an empty DataFrame.")
 
-            # 2. Extract the 'Close' prices and drop any rows with missing data.
-            close = df["Close"].dropna()
+            # 2. Extract the 'Close' prices and keep only rows that are fully
+            #    populated and belong to completed market days (no partial bar
+            #    for today). Both conditions are built as one mask and applied once.
+            #    Only 'Close' is kept so the other fields can be released early.
+            close = df["Close"]
+            del df
+            day = close.index.values.astype("datetime64[D]")
+            mask = (day < np.datetime64(today, "D")) & close.notna().to_numpy().all(axis=1)
+            # Skip the copy entirely when every row is already clean
+            if not mask.all():
+                close = close.iloc[mask]
 
-            # 3. Filter to keep only fully completed market days.
-            #    This prevents using a partial bar for the current day.
-            close = close[close.index.date < today]
-
-            # 4. Final check: ensure we still have data after filtering.
+            # 3. Final check: ensure we still have data after filtering.
             if close.empty:
                 raise ValueError("No complete data bars found for the specified period.")
 
             print(f"Successfully downloaded and validated data. Found {len(close)} days of data.")
-            return close
+            break
 
         except Exception as e:
             print(f"Attempt {attempt + 1} failed with error: {e}")
@@ -54,3 +74,8 @@ def load_or_download_data():
                 raise RuntimeError("Failed to download data after 3 retries.") from e
             print("Waiting 5 seconds before retrying...")
             time.sleep(5)
+
+    # Cache outside the retry loop so a failed write doesn't trigger a re-download
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    close.to_parquet(cache_path)
+    return close
@@ -0,0 +1,93 @@
+import pandas as pd
+import numpy as np
+
+def as_float_array(values):
+    """Return values as a NumPy float array, keeping float32 input as float32."""
+    arr = np.asarray(values)
+    if arr.dtype.kind != "f":
+        arr = arr.astype(np.float64)
+    return arr
+
+def _window_sum(values, window):
+    """Sum over a trailing window along axis 0 using cumulative sum differences."""
+    # Accumulate in float64 even for float32 input; a long running sum loses
+    # too much precision in single precision
+    cumulative = np.cumsum(values, axis=0, dtype=np.float64)
+    out = cumulative.copy()
+    out[window:] -= cumulative[:-window]
+    return out
+
+def rolling_mean(values, window, min_periods=None):
+    """
+    Rolling mean in O(N) regardless of window size.
+
+    Args:
+        values (array-like): 1-D or 2-D data, rolled along axis 0
+        window (int): Rolling window length
+        min_periods (int): Minimum non-NaN observations per window (defaults to window)
+
+    Returns:
+        np.ndarray: Rolling mean, NaN where a window has too few observations
+    """
+    return rolling_mean_std(values, window, min_periods, with_std=False)[0]
+
+def rolling_mean_std(values, window, min_periods=None, with_std=True):
+    """
+    Rolling mean and sample standard deviation in O(N) using cumulative sums.
+
+    NaNs are skipped the same way pandas' rolling aggregations skip them.
+
+    Args:
+        values (array-like): 1-D or 2-D data, rolled along axis 0
+        window (int): Rolling window length
+        min_periods (int): Minimum non-NaN observations per window (defaults to window)
+        with_std (bool): Whether to compute the standard deviation
+
+    Returns:
+        tuple: (mean, std) arrays shaped like values; std is None if not requested
+    """
+    if min_periods is None:
+        min_periods = window
+
+    arr = as_float_array(values)
+    valid = ~np.isnan(arr)
+    filled = np.where(valid, arr, arr.dtype.type(0))
+
+    count = _window_sum(valid, window)
+    total = _window_sum(filled, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+        std = None
+        if with_std:
+            total_sq = _window_sum(filled * filled, window)
+            var = (total_sq - total * mean) / (count - 1)
+            # Guard against tiny negative variances from rounding
+            np.maximum(var, 0.0, out=var)
+            std = np.sqrt(var)
+            std[count < max(min_periods, 2)] = np.nan
+
+    mean[count < max(min_periods, 1)] = np.nan
+    if std is not None:
+        std = std.astype(arr.dtype, copy=False)
+    return mean.astype(arr.dtype, copy=False), std
+
+def lag_signals(signals):
+    """
+    Shift signals forward one bar and zero-fill NaNs in a single buffer.
+
+    Equivalent to signals.shift(1).fillna(0) without the intermediate
+    copy made by fillna.
+
+    Args:
+        signals (pd.DataFrame): Signals aligned to the bar they were computed on
+
+    Returns:
+        pd.DataFrame: Signals usable on the following bar
+    """
+    values = as_float_array(signals.to_numpy())
+    out = np.empty_like(values)
+    out[:1] = 0.0
+    out[1:] = values[:-1]
+    np.nan_to_num(out, copy=False, nan=0.0)
+    return pd.DataFrame(out, index=signals.index, columns=signals.columns, copy=False)
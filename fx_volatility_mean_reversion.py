@@ -1,45 +1,90 @@
 import pandas as pd
 import numpy as np
+from fast_rolling import as_float_array, rolling_mean, rolling_mean_std, lag_signals
 
-def generate_fx_signals(price_data, lookback=50, volatility_period=14, clip_range=(-1, 1)):
+def _fx_raw_signal(prices, returns, lookback, volatility_period):
+    """
+    Volatility-normalized deviation from the moving average, scaled to [-1, 1].
+    
+    Args:
+        prices (np.ndarray): 2-D float array of prices with no missing values
+        returns (np.ndarray): Daily returns of prices
+        lookback (int): Period for moving average
+        volatility_period (int): Period for volatility calculation
+    
+    Returns:
+        np.ndarray: Raw FX signal shaped like prices
+    """
+    # Calculate moving average for all assets at once
+    sma = rolling_mean(prices, lookback)
+    
+    # Calculate volatility with minimum periods
+    _, volatility = rolling_mean_std(returns, volatility_period, min_periods=volatility_period//2)
+    
+    # Calculate normalized signal: -(price - sma) / volatility, reusing the
+    # sma buffer so the remaining steps all work in place
+    raw_signal = np.subtract(sma, prices, out=sma)
+    volatility += 1e-8
+    raw_signal /= volatility
+    
+    # Clip and scale signal
+    np.clip(raw_signal, -1.5, 1.5, out=raw_signal)
+    raw_signal *= 1.0 / 1.5
+    return raw_signal
+
+def generate_fx_signals(price_data, lookback=50, volatility_period=14, clip_range=(-1, 1), returns=None):
     """
     Enhanced FX volatility-adjusted mean reversion with standardized output.
     
+    Each asset's rolling windows span its own observations: an asset with
+    missing prices is rolled over its non-NaN rows only (as if the gaps
+    weren't there) and gets no signal on the dates it has no price.
+    
     Args:
         price_data (pd.DataFrame): Price data
         lookback (int): Period for moving average
         volatility_period (int): Period for volatility calculation
         clip_range (tuple): Signal clipping range
+        returns (pd.DataFrame, optional): Precomputed price_data.pct_change() to reuse
     
     Returns:
         pd.DataFrame: Standardized FX signals
     """
-    signals = pd.DataFrame(0.0, index=price_data.index, columns=price_data.columns)
+    prices = as_float_array(price_data.to_numpy())
+    valid = ~np.isnan(prices)
+    complete = valid.all(axis=0)
     
-    for asset in price_data.columns:
-        prices = price_data[asset].dropna()
-        
-        if len(prices) < max(lookback, volatility_period):
-            continue
-            
-        # Calculate moving average
-        sma = prices.rolling(window=lookback).mean()
-        
-        # Calculate deviation from mean
-        deviation = prices - sma
-        
-        # Calculate volatility with minimum periods
-        returns = prices.pct_change()
-        volatility = returns.rolling(window=volatility_period, min_periods=volatility_period//2).std()
-        
-        # Calculate normalized signal
-        raw_signal = -deviation / (volatility + 1e-8)
-        
-        # Clip and scale signal
-        clipped_signal = np.clip(raw_signal, -1.5, 1.5) / 1.5
+    if complete.any():
+        if returns is None:
+            returns = price_data.pct_change()
+        returns = as_float_array(returns.to_numpy())
+    
+    if complete.all():
+        # Common case: no missing prices, so every asset is rolled at once
+        raw_signal = _fx_raw_signal(prices, returns, lookback, volatility_period)
+    else:
+        raw_signal = np.full_like(prices, np.nan)
+        if complete.any():
+            raw_signal[:, complete] = _fx_raw_signal(
+                prices[:, complete], returns[:, complete], lookback, volatility_period
+            )
         
-        # Apply final clipping range and store
-        signals[asset] = np.clip(clipped_signal, clip_range[0], clip_range[1])
+        # Assets with gaps are rolled over their own observations, with
+        # returns taken between consecutive observed prices
+        for j in np.flatnonzero(~complete):
+            rows = valid[:, j]
+            observed = prices[rows, j][:, None]
+            observed_returns = np.full_like(observed, np.nan)
+            observed_returns[1:] = observed[1:] / observed[:-1] - 1
+            raw_signal[rows, j] = _fx_raw_signal(observed, observed_returns, lookback, volatility_period)[:, 0]
+    
+    # Apply the final clipping range
+    np.clip(raw_signal, clip_range[0], clip_range[1], out=raw_signal)
+    
+    # Assets without enough history get a flat signal
+    raw_signal[:, (price_data.count() < max(lookback, volatility_period)).to_numpy()] = 0.0
+    
+    signals = pd.DataFrame(raw_signal, index=price_data.index, columns=price_data.columns, copy=False)
     
     # Add shift to prevent lookahead bias
-    return signals.shift(1).fillna(0)
\ No newline at end of file
+    return lag_signals(signals)
\ No newline at end of file
@@ -0,0 +1,113 @@
+import numpy as np
+from numba import njit
+
+@njit(cache=True, nogil=True)
+def mean_reversion_kernel(returns, lookback, clip_low, clip_high):
+    """
+    Negated, clipped rolling z-score of each column, computed in one pass.
+
+    Each column keeps a running sum and sum of squares over the trailing
+    window, matching pandas' rolling(lookback) mean/std (a window containing
+    any NaN yields NaN). The GIL is released, so strategies running on the
+    thread pool in run_signals.py execute this concurrently.
+
+    Args:
+        returns (np.ndarray): 2-D float array of returns, one column per asset
+        lookback (int): Rolling window length
+        clip_low (float): Lower bound applied to the z-score
+        clip_high (float): Upper bound applied to the z-score
+
+    Returns:
+        np.ndarray: Mean reversion signal with the same shape as returns
+    """
+    n_rows, n_cols = returns.shape
+    out = np.full_like(returns, np.nan)
+
+    for j in range(n_cols):
+        total = 0.0
+        total_sq = 0.0
+        count = 0
+        for i in range(n_rows):
+            x = returns[i, j]
+            if not np.isnan(x):
+                total += x
+                total_sq += x * x
+                count += 1
+            if i >= lookback:
+                old = returns[i - lookback, j]
+                if not np.isnan(old):
+                    total -= old
+                    total_sq -= old * old
+                    count -= 1
+
+            if count < lookback or count < 2:
+                continue
+
+            mean = total / count
+            var = (total_sq - total * mean) / (count - 1)
+            if var < 0.0:
+                var = 0.0
+            zscore = (x - mean) / (np.sqrt(var) + 1e-8)
+            out[i, j] = -min(max(zscore, clip_low), clip_high)
+
+    return out
+
+@njit(cache=True, nogil=True)
+def pair_signals_kernel(ratios, first_cols, second_cols, window, min_periods,
+                        zscore_threshold, clip_low, clip_high, out):
+    """
+    Stat-arb pair signals fused into one pass per pair, written into out.
+
+    For each pair, walks its price ratio column keeping a running sum and
+    sum of squares over the trailing window (matching pandas'
+    rolling(window, min_periods=min_periods) with NaNs skipped), and writes
+    the thresholded, clipped signal to the first asset's column and its
+    negation to the second's. Writes go to row i + 1, so the output is
+    already shifted one bar; out is expected to be zero-initialised and
+    rows without a signal are set to 0.
+
+    Args:
+        ratios (np.ndarray): 2-D float array of price ratios, one column per pair
+        first_cols (np.ndarray): Output column of the first asset of each pair
+        second_cols (np.ndarray): Output column of the second asset of each pair
+        window (int): Rolling window length
+        min_periods (int): Minimum non-NaN observations per window
+        zscore_threshold (float): Z-score threshold for signal generation
+        clip_low (float): Lower bound of the final signal
+        clip_high (float): Upper bound of the final signal
+        out (np.ndarray): 2-D output array, one column per asset
+    """
+    n = ratios.shape[0]
+
+    for p in range(len(first_cols)):
+        a = first_cols[p]
+        b = second_cols[p]
+        total = 0.0
+        total_sq = 0.0
+        count = 0
+
+        for i in range(n - 1):
+            ratio = ratios[i, p]
+            if not np.isnan(ratio):
+                total += ratio
+                total_sq += ratio * ratio
+                count += 1
+            if i >= window:
+                old = ratios[i - window, p]
+                if not np.isnan(old):
+                    total -= old
+                    total_sq -= old * old
+                    count -= 1
+
+            signal = 0.0
+            if count >= min_periods and count >= 2 and not np.isnan(ratio):
+                mean = total / count
+                var = (total_sq - total * mean) / (count - 1)
+                if var < 0.0:
+                    var = 0.0
+                zscore = (ratio - mean) / (np.sqrt(var) + 1e-8)
+                signal = -min(max(zscore / zscore_threshold, -2.0), 2.0) / 2.0
+                signal = min(max(signal, clip_low), clip_high)
+
+            out[i + 1, a] = signal
+            out[i + 1, b] = -signal
@@ -1,7 +1,8 @@
 import pandas as pd
-import numpy as np
+from fast_rolling import as_float_array, lag_signals
+from kernels import mean_reversion_kernel
 
-def generate_mean_reversion_signals(prices, lookback=15, clip_range=(-1, 1)):
+def generate_mean_reversion_signals(prices, lookback=15, clip_range=(-1, 1), returns=None):
     """
     Enhanced mean reversion strategy with standardized signal generation.
     
@@ -9,20 +10,21 @@ def generate_mean_reversion_signals(prices, lookback=15, clip_range=(-1, 1)):
         prices (pd.DataFrame): Price data
         lookback (int): Lookback period (increased from 5 to 15 for reliability)
         clip_range (tuple): Signal clipping range
+        returns (pd.DataFrame, optional): Precomputed prices.pct_change() to reuse
     
     Returns:
         pd.DataFrame: Standardized signals
     """
-    returns = prices.pct_change()
-    rolling_mean = returns.rolling(lookback).mean()
-    rolling_std = returns.rolling(lookback).std()
+    if returns is None:
+        returns = prices.pct_change()
     
-    # Calculate z-score with minimum observations requirement
-    min_periods = max(lookback // 2, 5)
-    zscore = (returns - rolling_mean) / (rolling_std + 1e-8)
-    
-    # Generate mean reversion signal (negative z-score = buy signal)
-    signal = -np.clip(zscore, clip_range[0], clip_range[1])
+    # Rolling z-score, clipping and negation (negative z-score = buy signal)
+    # fused into one compiled pass per column; the kernel releases the GIL so
+    # it overlaps with the other strategy threads
+    values = mean_reversion_kernel(
+        as_float_array(returns.to_numpy()), lookback, float(clip_range[0]), float(clip_range[1])
+    )
+    signal = pd.DataFrame(values, index=returns.index, columns=returns.columns, copy=False)
     
     # Add shift to prevent lookahead bias and fill NaN
-    return signal.shift(1).fillna(0)
\ No newline at end of file
+    return lag_signals(signal)
\ No newline at end of file
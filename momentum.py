@@ -1,5 +1,5 @@
-import pandas as pd
 import numpy as np
+from fast_rolling import lag_signals
 
 def compute_momentum_signal(price_series, lookback=21, min_periods=None):
     """
@@ -37,14 +37,20 @@ def generate_momentum_signals(price_data, lookback=21, clip_range=(-1, 1)):
     Returns:
         pd.DataFrame: Standardized momentum signals
     """
-    signals = pd.DataFrame(0.0, index=price_data.index, columns=price_data.columns)
-    
-    for col in price_data.columns:
-        # Calculate momentum for each time step
-        for i in range(lookback, len(price_data)):
-            momentum = compute_momentum_signal(price_data[col].iloc[:i+1], lookback)
-            signals.iloc[i, signals.columns.get_loc(col)] = momentum
-    
-    # Standardize signals and add shift to prevent lookahead bias
-    signals = np.clip(signals, clip_range[0], clip_range[1])
-    return signals.shift(1).fillna(0)
\ No newline at end of file
+    momentum = price_data.pct_change(lookback)
+    
+    # Same warm-up rule as compute_momentum_signal: no signal until there is
+    # a full lookback and enough non-NaN history
+    min_periods = max(lookback // 2, 10)
+    ready = price_data.notna().cumsum() > min_periods
+    ready.iloc[:lookback] = False
+    momentum = momentum.where(ready, 0.0)
+    
+    # Fold the +/-0.5 extreme-value clip and clip_range into one pair of
+    # bounds so the momentum frame is clipped in a single pass
+    lower = min(max(clip_range[0], -0.5), clip_range[1])
+    upper = max(min(clip_range[1], 0.5), clip_range[0])
+    signals = momentum.clip(lower, upper)
+    
+    # Add shift to prevent lookahead bias
+    return lag_signals(signals)
\ No newline at end of file
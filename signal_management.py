@@ -3,7 +3,6 @@
 
 import pandas as pd
 import numpy as np
-from scipy.stats import pearsonr
 
 class SignalManager:
     """
@@ -28,6 +27,9 @@ class SignalManager:
         self.max_position_size = max_position_size
         self.max_sector_exposure = max_sector_exposure
         
+        # (index, sectors, sector codes) from the last apply_risk_controls call
+        self._sector_cache = None
+        
     def decorrelate_signals(self, signals_dict):
         """
         Remove highly correlated signals by comparing them only on assets they both trade.
@@ -35,7 +37,8 @@ class SignalManager:
         This function identifies pairs of strategies with overlapping asset universes.
         For each pair, it calculates the correlation of their aggregate signals on
         just those shared assets. If two strategies are too highly correlated, the
-        one with the lower average absolute signal is removed.
+        one with the lower average absolute signal is removed, resolving the most
+        correlated pairs first.
         
         Args:
             signals_dict (dict): A dictionary where keys are strategy names and
@@ -45,58 +48,230 @@ class SignalManager:
             dict: A dictionary of cleaned, decorrelated signals.
         """
         cleaned_signals = signals_dict.copy()
+        strategy_names = list(signals_dict.keys())
         
-        # Pre-calculate the list of non-NaN assets for each strategy
-        strategy_assets = {}
-        for name, signal_df in signals_dict.items():
-            # Get assets that have at least one non-NaN signal
-            strategy_assets[name] = signal_df.dropna(axis=1, how='all').columns.tolist()
-
+        # A pair's correlation doesn't depend on which strategies have been removed,
+        # so compute every pair's correlation in one vectorized pass up front
+        stacked = self._stack_complete_signals(signals_dict)
+        if stacked is not None:
+            # Every strategy trades every asset on every date, so each pair is
+            # compared on all assets and the per-pair alignment can be skipped
+            corr_matrix = self._stacked_correlations(stacked)
+        else:
+            # Pre-calculate the list of non-NaN assets for each strategy
+            strategy_assets = {}
+            for name, signal_df in signals_dict.items():
+                # Get assets that have at least one non-NaN signal
+                strategy_assets[name] = signal_df.dropna(axis=1, how='all').columns.tolist()
+            
+            corr_matrix = self._pairwise_correlations(signals_dict, strategy_assets)
+        
+        # Average absolute value of each *original* full signal dataframe, scanned
+        # once per strategy and only for strategies in an over-correlated pair
+        # (the score is only read to break those ties)
+        abs_score = np.full(len(strategy_names), np.nan)
+        with np.errstate(invalid='ignore'):
+            contested = np.flatnonzero((np.abs(corr_matrix) > self.max_correlation).any(axis=0))
+        for k in contested:
+            abs_score[k] = np.abs(signals_dict[strategy_names[k]].values).mean()
+        
+        for removed, kept, corr in self._decorrelate_matrix(corr_matrix, abs_score):
+            print(f"Removing {strategy_names[removed]} due to high correlation ({corr:.2f}) with {strategy_names[kept]}")
+            del cleaned_signals[strategy_names[removed]]
+        
+        return cleaned_signals
+    
+    def _decorrelate_matrix(self, corr_matrix, abs_score):
+        """
+        Decide which strategies to remove from their correlation matrix.
+        
+        Over-correlated pairs are visited from the most to the least correlated
+        (ties in strategy order), and in each the strategy with the lower
+        average absolute signal is dropped. A pair whose strategy has already
+        been dropped is skipped, so the strongest redundancies are resolved
+        first regardless of the order the strategies were given in.
+        
+        Args:
+            corr_matrix (np.ndarray): Symmetric (N x N) correlation matrix, NaN
+                                      where a pair can't be compared.
+            abs_score (np.ndarray): Average absolute signal of each strategy.
+        
+        Returns:
+            list: (removed, kept, correlation) tuples of strategy positions,
+                  in the order the removals are made.
+        """
+        n_strategies = len(abs_score)
+        active = np.ones(n_strategies, dtype=bool)
+        removals = []
+        
+        # Every over-correlated pair (NaN pairs never qualify), strongest first
+        with np.errstate(invalid='ignore'):
+            over = np.triu(np.abs(corr_matrix) > self.max_correlation, k=1)
+        rows, cols = np.nonzero(over)
+        order = np.argsort(-np.abs(corr_matrix[rows, cols]), kind='stable')
+        
+        for i, j in zip(rows[order], cols[order]):
+            # Check if strategies are still in our cleaned list
+            if not (active[i] and active[j]):
+                continue
+            
+            # Keep the signal with higher average absolute value
+            corr = corr_matrix[i, j]
+            if abs_score[i] < abs_score[j]:
+                removals.append((i, j, corr))
+                active[i] = False
+            else:
+                removals.append((j, i, corr))
+                active[j] = False
+        
+        return removals
+    
+    @staticmethod
+    def _stack_complete_signals(signals_dict):
+        """
+        Stack the strategies' signals if they share one NaN-free frame layout.
+        
+        Args:
+            signals_dict (dict): Strategy names mapped to DataFrames of signals.
+        
+        Returns:
+            np.ndarray or None: Signals of shape (strategies, dates, assets), or
+                                None if the frames differ in index or columns,
+                                have no assets, or contain any NaN.
+        """
+        frames = list(signals_dict.values())
+        if not frames or len(frames[0].columns) == 0:
+            return None
+        
+        ref = frames[0]
+        if not all(df.index.equals(ref.index) and df.columns.equals(ref.columns) for df in frames):
+            return None
+        
+        stacked = np.stack([df.to_numpy(dtype=np.float64) for df in frames])
+        if np.isnan(stacked).any():
+            return None
+        return stacked
+    
+    @staticmethod
+    def _stacked_correlations(stacked):
+        """
+        Correlation matrix of strategy aggregate signals for NaN-free stacked signals.
+        
+        Gives the same result as _pairwise_correlations when every strategy
+        covers every asset and date: each aggregate is the mean over all assets.
+        
+        Args:
+            stacked (np.ndarray): Signals of shape (strategies, dates, assets).
+        
+        Returns:
+            np.ndarray: Symmetric (N x N) matrix with a NaN diagonal; all NaN
+                        with 10 or fewer dates.
+        """
+        n_strategies, n_dates, _ = stacked.shape
+        corr_matrix = np.full((n_strategies, n_strategies), np.nan)
+        if n_strategies < 2 or n_dates <= 10:
+            return corr_matrix
+        
+        # One aggregate column per strategy, correlated in a single call;
+        # constant aggregates give NaN as in the general path
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr_matrix[:] = np.corrcoef(stacked.mean(axis=2), rowvar=True)
+        np.fill_diagonal(corr_matrix, np.nan)
+        return corr_matrix
+    
+    def _pairwise_correlations(self, signals_dict, strategy_assets):
+        """
+        Correlation matrix of strategy aggregate signals on their shared assets.
+        
+        For each pair of strategies, the aggregate signal is the mean over the
+        assets both trade, on the dates where both have complete data. The
+        aggregates for all pairs are stacked as columns of two (T x P) matrices
+        so every Pearson correlation comes out of a single masked reduction.
+        
+        Args:
+            signals_dict (dict): Strategy names mapped to DataFrames of signals.
+            strategy_assets (dict): Strategy names mapped to their non-NaN assets.
+        
+        Returns:
+            np.ndarray: Symmetric (N x N) matrix; NaN where a pair shares no
+                        assets or has 10 or fewer common observations.
+        """
         strategy_names = list(signals_dict.keys())
+        n_strategies = len(strategy_names)
+        corr_matrix = np.full((n_strategies, n_strategies), np.nan)
         
+        # Collect the aggregate signals for every overlapping pair
+        pairs = []
         for i, strat1 in enumerate(strategy_names):
-            for j, strat2 in enumerate(strategy_names[i+1:], i+1):
-                # Check if strategies are still in our cleaned list
-                if strat1 not in cleaned_signals or strat2 not in cleaned_signals:
-                    continue
-
-                # Find the common assets between the two strategies
-                assets1 = strategy_assets[strat1]
-                assets2 = strategy_assets[strat2]
-                common_assets = list(set(assets1) & set(assets2))
-
-                # If there are no common assets, they are already decorrelated. Skip.
-                if not common_assets:
-                    continue
-
-                # --- Comparison Logic for Overlapping Strategies ---
-                # Isolate the signals for only the common assets
-                sig1_subset = cleaned_signals[strat1][common_assets].dropna()
-                sig2_subset = cleaned_signals[strat2][common_assets].dropna()
-
-                if len(sig1_subset) > 10 and len(sig2_subset) > 10:
-                    # Align the two dataframes by their index (date)
-                    common_idx = sig1_subset.index.intersection(sig2_subset.index)
-                    if len(common_idx) > 10:
-                        # Calculate the aggregate signal for the overlapping assets only
-                        agg_sig1 = sig1_subset.loc[common_idx].mean(axis=1)
-                        agg_sig2 = sig2_subset.loc[common_idx].mean(axis=1)
-                        
-                        # Now calculate the correlation on these comparable series
-                        corr, _ = pearsonr(agg_sig1, agg_sig2)
-                        
-                        if abs(corr) > self.max_correlation:
-                            # Keep the signal with higher average absolute value
-                            # We compare the mean of the absolute values of the *original* full signal dataframe
-                            if abs(cleaned_signals[strat1].values).mean() < abs(cleaned_signals[strat2].values).mean():
-                                print(f"Removing {strat1} due to high correlation ({corr:.2f}) with {strat2}")
-                                del cleaned_signals[strat1]
-                                break
-                            else:
-                                print(f"Removing {strat2} due to high correlation ({corr:.2f}) with {strat1}")
-                                del cleaned_signals[strat2]
+            for j in range(i + 1, n_strategies):
+                strat2 = strategy_names[j]
+                common_assets = list(set(strategy_assets[strat1]) & set(strategy_assets[strat2]))
+                if common_assets:
+                    pairs.append((i, j, common_assets))
         
-        return cleaned_signals
+        if not pairs:
+            return corr_matrix
+        
+        index = signals_dict[strategy_names[0]].index
+        for signal_df in signals_dict.values():
+            index = index.union(signal_df.index)
+        
+        # Align each strategy once; aggregates are cached per (strategy, asset set)
+        # because a strategy is usually compared on the same assets many times
+        aligned = {}
+        for name in {strategy_names[k] for i, j, _ in pairs for k in (i, j)}:
+            signal_df = signals_dict[name].reindex(index)
+            aligned[name] = (signal_df.to_numpy(dtype=np.float64), {col: c for c, col in enumerate(signal_df.columns)})
+        aggregates = {}
+        
+        agg1 = np.zeros((len(index), len(pairs)))
+        agg2 = np.zeros((len(index), len(pairs)))
+        mask = np.zeros((len(index), len(pairs)), dtype=bool)
+        for p, (i, j, common_assets) in enumerate(pairs):
+            valid1, agg1[:, p] = self._aggregate_signal(strategy_names[i], common_assets, aligned, aggregates)
+            valid2, agg2[:, p] = self._aggregate_signal(strategy_names[j], common_assets, aligned, aggregates)
+            # Dates where both subsets have no missing values
+            mask[:, p] = valid1 & valid2
+        
+        # Pearson correlation of every column pair at once on the masked rows
+        counts = mask.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            centered1 = np.where(mask, agg1 - (agg1 * mask).sum(axis=0) / counts, 0.0)
+            centered2 = np.where(mask, agg2 - (agg2 * mask).sum(axis=0) / counts, 0.0)
+            cov = np.einsum('tp,tp->p', centered1, centered2)
+            norm = np.sqrt(np.einsum('tp,tp->p', centered1, centered1) * np.einsum('tp,tp->p', centered2, centered2))
+            # Same result as pearsonr's r, without its p-value computation;
+            # clipped like pearsonr to absorb rounding just outside [-1, 1]
+            corr = np.clip(cov / norm, -1.0, 1.0)
+        corr[counts <= 10] = np.nan
+        
+        rows = [i for i, _, _ in pairs]
+        cols = [j for _, j, _ in pairs]
+        corr_matrix[rows, cols] = corr
+        corr_matrix[cols, rows] = corr
+        return corr_matrix
+    
+    def _aggregate_signal(self, name, assets, aligned, aggregates):
+        """
+        Mean signal of one strategy over a subset of its assets, memoized.
+        
+        Args:
+            name (str): Strategy name.
+            assets (list): Assets to average over.
+            aligned (dict): Strategy names mapped to (values, column positions)
+                            aligned to the shared date index.
+            aggregates (dict): Cache of previously computed aggregates.
+        
+        Returns:
+            tuple: (rows with no missing values, row mean with 0 on incomplete rows)
+        """
+        key = (name, frozenset(assets))
+        if key not in aggregates:
+            values, positions = aligned[name]
+            subset = values[:, sorted(positions[asset] for asset in assets)]
+            valid = ~np.isnan(subset).any(axis=1)
+            aggregates[key] = (valid, np.where(valid, subset.mean(axis=1), 0.0))
+        return aggregates[key]
     
     def apply_risk_controls(self, combined_signal, sectors=None):
         """
@@ -118,25 +293,73 @@ class SignalManager:
                 "fx": ["EURUSD=X"]
             }
         
-        # Apply position size limits
-        controlled_signal = np.clip(combined_signal, -self.max_position_size, self.max_position_size)
-        
-        # Calculate sector exposures
-        sector_exposure = {}
-        for sector, assets in sectors.items():
-            sector_assets = [asset for asset in assets if asset in controlled_signal.index]
-            if sector_assets:
-                sector_exposure[sector] = sum(abs(controlled_signal[asset]) for asset in sector_assets)
-        
-        # Scale down if sector exposure too high
-        for sector, exposure in sector_exposure.items():
-            if exposure > self.max_sector_exposure:
-                scale_factor = self.max_sector_exposure / exposure
-                sector_assets = [asset for asset in sectors[sector] if asset in controlled_signal.index]
-                for asset in sector_assets:
-                    controlled_signal[asset] *= scale_factor
-        
-        return controlled_signal
+        # Sector membership as (asset position, sector code) pairs, reused while
+        # the index and sectors are unchanged
+        asset_pos, sector_codes = self._sector_codes(combined_signal.index, sectors)
+        if len(asset_pos) == 0:
+            # Apply position size limits only
+            return np.clip(combined_signal, -self.max_position_size, self.max_position_size)
+        
+        controlled = self._risk_controls_np(combined_signal.to_numpy(), asset_pos, sector_codes, len(sectors))
+        return pd.Series(controlled, index=combined_signal.index, name=combined_signal.name)
+    
+    def _risk_controls_np(self, values, asset_pos, sector_codes, n_sectors):
+        """
+        Position and sector limits applied to a plain array of asset signals.
+        
+        Args:
+            values (np.ndarray): 1-D signal, one entry per asset.
+            asset_pos (np.ndarray): Asset position of each sector membership.
+            sector_codes (np.ndarray): Sector code of each sector membership.
+            n_sectors (int): Number of sectors.
+        
+        Returns:
+            np.ndarray: The risk-controlled signal.
+        """
+        # Apply position size limits, clipping a single float64 copy in place
+        controlled = values.astype(np.float64, copy=True)
+        np.clip(controlled, -self.max_position_size, self.max_position_size, out=controlled)
+        
+        # Calculate all sector exposures in a single bincount
+        exposures = np.bincount(sector_codes, weights=np.abs(controlled[asset_pos]), minlength=n_sectors)
+        
+        # Scale down sectors whose exposure is too high; an asset listed under
+        # several breaching sectors gets each sector's scale factor applied
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = np.where(exposures > self.max_sector_exposure, self.max_sector_exposure / exposures, 1.0)
+        np.multiply.at(controlled, asset_pos, scale[sector_codes])
+        
+        return controlled
+    
+    def _sector_codes(self, index, sectors):
+        """
+        Sector membership of the assets in index, as integer code arrays.
+        
+        Args:
+            index (pd.Index): The assets of the signal being controlled.
+            sectors (dict): A dictionary mapping sector names to lists of assets.
+        
+        Returns:
+            tuple: (asset positions in index, sector code of each membership),
+                   where sector codes follow the order of sectors.
+        """
+        if self._sector_cache is not None:
+            cached_index, cached_sectors, codes = self._sector_cache
+            if cached_sectors == sectors and cached_index.equals(index):
+                return codes
+        
+        position = {asset: i for i, asset in enumerate(index)}
+        asset_pos = []
+        sector_codes = []
+        for code, assets in enumerate(sectors.values()):
+            for asset in dict.fromkeys(assets):
+                if asset in position:
+                    asset_pos.append(position[asset])
+                    sector_codes.append(code)
+        
+        codes = (np.array(asset_pos, dtype=np.intp), np.array(sector_codes, dtype=np.intp))
+        self._sector_cache = (index, {k: list(v) for k, v in sectors.items()}, codes)
+        return codes
     
     def combine_signals_optimally(self, signals_dict, combination_method="equal_weight"):
         """
@@ -153,27 +376,71 @@ class SignalManager:
         if not signals_dict:
             return pd.Series()
         
-        if combination_method == "equal_weight":
-            combined = sum(signals_dict.values()) / len(signals_dict)
-        elif combination_method == "volatility_weighted":
-            # Weight by inverse volatility
-            weights = {}
-            total_inv_vol = 0
+        if combination_method == "volatility_weighted":
+            # Weight by inverse volatility, using the mean standard deviation
+            # across assets as a proxy for strategy volatility
+            frames = list(signals_dict.values())
+            vols = np.array([signal.std().mean() for signal in frames], dtype=np.float64)
             
-            for name, signal in signals_dict.items():
-                # Use the mean standard deviation across assets as a proxy for strategy volatility
-                vol = signal.std().mean()
-                if vol > 0:
-                    inv_vol = 1 / vol
-                    weights[name] = inv_vol
-                    total_inv_vol += inv_vol
+            # Strategies without positive volatility get no weight
+            keep = vols > 0
+            weights = 1 / vols[keep]
             
             # Normalize weights
-            for name in weights:
-                weights[name] /= total_inv_vol
+            weights /= weights.sum()
             
-            combined = sum(weights[name] * signals_dict[name] for name in weights)
+            stacked, index, columns = self._stack_signals([frame for frame, k in zip(frames, keep) if k])
+            combined = self._combine_np(stacked, weights)
         else:
-            combined = sum(signals_dict.values()) / len(signals_dict)
+            # "equal_weight" and any unknown method
+            stacked, index, columns = self._stack_signals(list(signals_dict.values()))
+            combined = self._combine_np(stacked)
+        
+        combined = pd.DataFrame(combined, index=index, columns=columns, copy=False)
+        return combined.fillna(0)
+    
+    @staticmethod
+    def _combine_np(stacked, weights=None):
+        """
+        Weighted (or equal-weighted) sum of stacked strategy signals.
+        
+        Args:
+            stacked (np.ndarray): Signals of shape (strategies, dates, assets).
+            weights (np.ndarray, optional): Weight of each strategy, summing to 1.
+                                            Defaults to equal weights.
+        
+        Returns:
+            np.ndarray: Combined signal of shape (dates, assets).
+        """
+        if weights is None:
+            return stacked.mean(axis=0)
+        return np.tensordot(weights, stacked, axes=1)
+    
+    @staticmethod
+    def _stack_signals(frames):
+        """
+        Stack signal DataFrames into one (strategies, dates, assets) array.
+        
+        Frames are aligned on the union of their indexes and columns, exactly
+        as chained DataFrame addition would align them, so an asset or date a
+        strategy doesn't cover is NaN and propagates through the reduction.
+        
+        Args:
+            frames (list): Signal DataFrames to stack
+        
+        Returns:
+            tuple: (np.ndarray of shape (N, T, A), union index, union columns)
+        """
+        if not frames:
+            return np.empty((0, 0, 0)), pd.Index([]), pd.Index([])
+        
+        index, columns = frames[0].index, frames[0].columns
+        for df in frames[1:]:
+            index = index.union(df.index)
+            columns = columns.union(df.columns)
         
-        return combined.fillna(0)
\ No newline at end of file
+        stacked = np.stack([
+            df.reindex(index=index, columns=columns).to_numpy(dtype=np.float64)
+            for df in frames
+        ])
+        return stacked, index, columns
\ No newline at end of file
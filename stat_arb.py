@@ -1,5 +1,7 @@
 import pandas as pd
 import numpy as np
+from fast_rolling import as_float_array
+from kernels import pair_signals_kernel
 
 def generate_stat_arb_signals(price_data, lookback=20, zscore_threshold=2.0, clip_range=(-1, 1)):
     """
@@ -14,42 +16,60 @@ def generate_stat_arb_signals(price_data, lookback=20, zscore_threshold=2.0, cli
     Returns:
         pd.DataFrame: Standardized stat arb signals
     """
-    signals = pd.DataFrame(0.0, index=price_data.index, columns=price_data.columns)
+    # Enhanced pair selection with correlation validation: candidate pairs
+    # with their minimum correlation thresholds
+    candidates = [
+        ('BTC-USD', 'ETH-USD', 0.5),  # BTC-ETH pair
+        ('SPY', 'QQQ', 0.7),          # SPY-QQQ pair
+    ]
+    candidates = [(a1, a2, threshold) for a1, a2, threshold in candidates
+                  if a1 in price_data.columns and a2 in price_data.columns]
     
-    # Enhanced pair selection with correlation validation
+    # One correlation matrix over every candidate asset instead of a
+    # Series.corr call per pair
     pairs = []
+    if candidates:
+        candidate_cols = list(dict.fromkeys(asset for a1, a2, _ in candidates for asset in (a1, a2)))
+        candidate_idx = {col: i for i, col in enumerate(candidate_cols)}
+        candidate_prices = price_data[candidate_cols]
+        arr = candidate_prices.to_numpy(dtype=np.float64)
+        if np.isnan(arr).any():
+            # Keep Series.corr's pairwise-complete handling of missing prices
+            corr = candidate_prices.corr().to_numpy()
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = np.corrcoef(arr, rowvar=False)
+        
+        for a1, a2, threshold in candidates:
+            if corr[candidate_idx[a1], candidate_idx[a2]] > threshold:
+                pairs.append((a1, a2))
     
-    # BTC-ETH pair
-    if 'BTC-USD' in price_data.columns and 'ETH-USD' in price_data.columns:
-        btc_eth_corr = price_data['BTC-USD'].corr(price_data['ETH-USD'])
-        if btc_eth_corr > 0.5:  # Minimum correlation threshold
-            pairs.append(('BTC-USD', 'ETH-USD'))
-    
-    # SPY-QQQ pair
-    if 'SPY' in price_data.columns and 'QQQ' in price_data.columns:
-        spy_qqq_corr = price_data['SPY'].corr(price_data['QQQ'])
-        if spy_qqq_corr > 0.7:  # Minimum correlation threshold
-            pairs.append(('SPY', 'QQQ'))
+    # Pair signals are written straight into a preallocated zero block (already
+    # shifted one bar to prevent lookahead bias) and wrapped in a DataFrame once
+    prices = as_float_array(price_data.to_numpy())
+    values = np.zeros_like(prices)
     
-    for asset1, asset2 in pairs:
-        # Calculate price ratio
-        ratio = price_data[asset1] / price_data[asset2]
-        
-        # Calculate rolling statistics with minimum periods
-        min_periods = max(lookback // 2, 10)
-        rolling_mean = ratio.rolling(lookback, min_periods=min_periods).mean()
-        rolling_std = ratio.rolling(lookback, min_periods=min_periods).std()
-        
-        # Calculate z-score
-        zscore = (ratio - rolling_mean) / (rolling_std + 1e-8)
-        
-        # Generate signal with threshold
-        pair_signal = -np.clip(zscore / zscore_threshold, -2, 2) / 2.0
+    if pairs:
+        # Every pair's price ratio in one vectorized division, so the kernel
+        # reads each ratio instead of dividing twice per bar (once as it
+        # enters the window and again as it leaves)
+        col_idx = {col: i for i, col in enumerate(price_data.columns)}
+        first_cols = np.array([col_idx[asset1] for asset1, _ in pairs], dtype=np.int64)
+        second_cols = np.array([col_idx[asset2] for _, asset2 in pairs], dtype=np.int64)
+        ratios = prices[:, first_cols] / prices[:, second_cols]
         
-        # Apply final clipping and assign signals
-        final_signal = np.clip(pair_signal, clip_range[0], clip_range[1])
-        signals[asset1] = final_signal
-        signals[asset2] = -final_signal
+        # Rolling z-score, thresholding, clipping and the shift are fused
+        # into one compiled pass per pair over the ratio columns
+        pair_signals_kernel(
+            ratios,
+            first_cols,
+            second_cols,
+            lookback,
+            max(lookback // 2, 10),
+            float(zscore_threshold),
+            float(clip_range[0]),
+            float(clip_range[1]),
+            values
+        )
     
-    # Add shift to prevent lookahead bias
-    return signals.shift(1).fillna(0)
\ No newline at end of file
+    return pd.DataFrame(values, index=price_data.index, columns=price_data.columns, copy=False)
\ No newline at end of file